@@ -50,14 +50,22 @@ def main():
             print(f"{comp}: {count}")
 
     if args.count_transistors:
-        count = analyzer.get_transistor_count()
+        try:
+            count = analyzer.get_transistor_count()
+        except ValueError as e:
+            print(f"Error counting transistors: {e}")
+            sys.exit(1)
         print(f"\nTotal Transistors (Flattend): {count}")
 
     if args.model_usage:
         print("\n--- Model Usage (Flattened) ---")
-        usage = analyzer.get_model_usage()
-        for model in sorted(usage.keys()):
-            print(f"{model}: {usage[model]}")
+        try:
+            usage = analyzer.get_model_usage()
+        except ValueError as e:
+            print(f"Error counting model usage: {e}")
+            sys.exit(1)
+        if usage:
+            sys.stdout.write("\n".join(f"{model}: {usage[model]}" for model in sorted(usage.keys())) + "\n")
             
         if analyzer.unresolved_subckts:
             print("\n[WARNING] The following subcircuits were instantiated but not defined (treated as black boxes):")
@@ -89,10 +97,14 @@ def main():
 
     if args.flatten:
         print("\n--- Flattened Netlist Components ---")
-        flat = analyzer.flatten()
-        for comp in flat.components:
-            # Basic print of name and nodes
-            print(f"{comp.name} {' '.join(comp.nodes)}")
+        try:
+            flat = analyzer.flatten()
+        except ValueError as e:
+            print(f"Error flattening circuit: {e}")
+            sys.exit(1)
+        # Basic print of name and nodes, streamed through writelines() since
+        # flat netlists can have millions of components
+        sys.stdout.writelines(f"{comp.name} {' '.join(comp.nodes)}\n" for comp in flat.components)
 
 if __name__ == "__main__":
     main()
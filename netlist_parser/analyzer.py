@@ -1,6 +1,67 @@
-from typing import Dict, List, Counter, Optional
-import copy
-from .ast import Circuit, Subckt, Component, SubcktInstance, Mosfet, Resistor, Capacitor, Inductor, Bjt, Diode, VoltageSource, CurrentSource
+from typing import Dict, Iterable, List, Counter, Optional, Tuple, Union
+from sys import intern
+from collections import defaultdict
+from dataclasses import fields
+from functools import lru_cache
+from .ast import Circuit, Subckt, Component, SubcktInstance, Mosfet, Bjt, Diode, ScopeSummary
+
+# Component types whose `model` field names a device model
+_MODEL_BEARING: frozenset[type] = frozenset({Mosfet, Bjt, Diode})
+
+# Global ground node names: "0" and every casing of "GND"
+_GND_NODES: frozenset[str] = frozenset(["0"] + [g + n + d for g in "gG" for n in "nN" for d in "dD"])
+
+# Component type -> fields copied unchanged by _clone_with
+_CLONE_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+def _clone_with(comp: Component, name: str, nodes: Tuple[str, ...]) -> Component:
+    """
+    Returns a shallow copy of a component with a new name and nodes.
+    Other fields (parameters, model, ...) are shared with the original, which
+    is safe because flattening never mutates them.
+    Bypasses __init__ (and dataclasses.replace, which re-validates every
+    field) since this runs once per flattened component.
+    """
+    comp_type = type(comp)
+    field_names = _CLONE_FIELDS.get(comp_type)
+    if field_names is None:
+        field_names = tuple(f.name for f in fields(comp_type) if f.name not in ("name", "nodes"))
+        _CLONE_FIELDS[comp_type] = field_names
+
+    clone = object.__new__(comp_type)
+    clone.name = name
+    clone.nodes = nodes
+    for field_name in field_names:
+        setattr(clone, field_name, getattr(comp, field_name))
+    return clone
+
+@lru_cache(maxsize=None)
+def _classify_leaf(subckt_name: str, param_keys: frozenset) -> str:
+    """
+    Classifies a leaf/unresolved subckt instance from its subckt name and
+    parameter names. Cached, since flat netlists repeat a handful of leaf
+    cells many times.
+    """
+    name_lower = subckt_name.lower()
+    
+    # Check heuristics
+    
+    # MOSFET: Name contains fet/mos AND has W/L params
+    if "fet" in name_lower or "mos" in name_lower:
+        # Check for W and L params (case-insensitive keys)
+        param_keys_upper = {k.upper() for k in param_keys}
+        if "W" in param_keys_upper and "L" in param_keys_upper:
+            return "Mosfet"
+            
+    # BJT: Name contains bjt/npn/pnp
+    if "bjt" in name_lower or "npn" in name_lower or "pnp" in name_lower:
+        return "Bjt"
+        
+    # Diode: Name contains diode
+    if "diode" in name_lower:
+        return "Diode"
+        
+    return "SubcktInstance"
 
 class NetlistAnalyzer:
     def __init__(self, circuit: Circuit, top_cell_name: Optional[str] = None):
@@ -8,21 +69,74 @@ class NetlistAnalyzer:
         self.top_cell_name = top_cell_name
         self.unresolved_subckts: set[str] = set()
 
+        # Name -> definition lookup, built once. Reversed so that the first
+        # definition wins on duplicate names, as the old linear scans did.
+        self._subckt_map: Dict[str, Subckt] = {s.name: s for s in reversed(self.circuit.subcircuits)}
+        self._subckt_names: set[str] = set(self._subckt_map)
+
+        # Structural (non-empty) subckts -> (ports, components) as tuples.
+        # Absence means leaf cell or unresolved, so the hot paths need one
+        # lookup instead of a lookup plus an emptiness check.
+        self._structural: Dict[str, Tuple[Tuple[str, ...], Tuple[Component, ...]]] = {
+            name: (tuple(s.ports), tuple(s.components))
+            for name, s in self._subckt_map.items() if s.components
+        }
+
+        # Single scan of all subckt bodies for the instantiated subckt names
+        # and a model -> using subckts index
+        instantiated = set()
+        self._model_to_subckts: Dict[str, set[str]] = defaultdict(set)
+        for s in self.circuit.subcircuits:
+            for c in s.components:
+                if isinstance(c, SubcktInstance):
+                    instantiated.add(c.subckt_name)
+                elif type(c) in _MODEL_BEARING and c.model:
+                    self._model_to_subckts[c.model].add(s.name)
+
+        # Also index the top level if not empty (and not auto-using top cell)
+        # Note: If find_top_cell logic is used, those are technically in a subckt.
+        # But if the user parses a flat file, we check circuit.components.
+        for c in self.circuit.components:
+            if type(c) in _MODEL_BEARING and c.model:
+                self._model_to_subckts[c.model].add(self.circuit.name)
+
+        # Subckts known to have components: the structural ones, plus those
+        # whose components were streamed by SpiceParser.iter_parse
+        self._non_leaf: set[str] = set(self._structural)
+        for scope_name, summary in self.circuit.streamed.items():
+            for model in summary.models:
+                self._model_to_subckts[model].add(scope_name)
+            if scope_name == self.circuit.name:
+                continue
+            self._non_leaf.add(scope_name)
+            instantiated.update(sub_name for sub_name, _ in summary.instances)
+
+        # Top cells: subckts defined but never instantiated by another subckt
+        self._top_cells: List[str] = sorted(self._subckt_names - instantiated)
+
+        # Result of flatten(), computed on first use
+        self._flat_cache: Optional[Circuit] = None
+
+        # Classification and model counts of the flattened circuit, computed
+        # on first use by _hierarchy_counts()
+        self._counts_cache: Optional[Tuple[Counter, Counter]] = None
+
+
         if self.top_cell_name:
             # Validate existence immediately
-            if not any(s.name == self.top_cell_name for s in self.circuit.subcircuits):
+            if self.top_cell_name not in self._subckt_names:
                  raise ValueError(f"Top cell '{self.top_cell_name}' not found in netlist.")
 
     def _get_root_components(self) -> List[Component]:
         """Determines the starting components based on top_cell_name or auto-detection."""
         if self.top_cell_name:
             # User specified top cell
-            subckt = next((s for s in self.circuit.subcircuits if s.name == self.top_cell_name), None)
+            subckt = self._subckt_map.get(self.top_cell_name)
             if not subckt:
                 raise ValueError(f"Top cell '{self.top_cell_name}' not found in netlist.")
             # For a subcircuit root, we treat its components as the top level.
             # (Ports are treated as external nodes, same as auto-detect)
-            return copy.deepcopy(subckt.components)
+            return list(subckt.components)
         
         if self.circuit.components:
             return self.circuit.components
@@ -30,7 +144,7 @@ class NetlistAnalyzer:
         # Auto-detect
         top_subckt = self.find_top_cell()
         if top_subckt:
-            return copy.deepcopy(top_subckt.components)
+            return list(top_subckt.components)
         
         return []
 
@@ -44,117 +158,118 @@ class NetlistAnalyzer:
             return type(comp).__name__
             
         # It's a SubcktInstance. Check if it's a leaf/blackbox.
-        subckt_def = next((s for s in self.circuit.subcircuits if s.name == comp.subckt_name), None)
-        
         # If definition found and has components, it's a structural block, not a primitive.
-        if subckt_def and subckt_def.components:
+        if comp.subckt_name in self._non_leaf:
              return "SubcktInstance"
              
         # It's a leaf (empty subckt definition) or unresolved (treated as leaf).
-        name_lower = comp.subckt_name.lower()
-        
-        # Check heuristics
-        
-        # MOSFET: Name contains fet/mos AND has W/L params
-        if "fet" in name_lower or "mos" in name_lower:
-            # Check for W and L params (case-insensitive keys)
-            # Parameters might be in comp.parameters dict
-            # We need to handle case-insensitivity of keys
-            param_keys = {k.upper() for k in comp.parameters.keys()}
-            if "W" in param_keys and "L" in param_keys:
-                return "Mosfet"
-                
-        # BJT: Name contains bjt/npn/pnp
-        if "bjt" in name_lower or "npn" in name_lower or "pnp" in name_lower:
-            return "Bjt"
-            
-        # Diode: Name contains diode
-        if "diode" in name_lower:
-            return "Diode"
-            
-        return "SubcktInstance"
+        return _classify_leaf(comp.subckt_name, frozenset(comp.parameters))
 
-    def get_stats(self) -> Dict[str, int]:
-        """Returns a count of all primitives in the top-level circuit (no flattening)."""
-        stats = Counter()
-        try:
-            comps = self._get_root_components()
-        except ValueError:
-            return {}
+    def get_stats(self, source: Union[Circuit, Iterable[Tuple[Tuple[str, ...], Component]], None] = None) -> Dict[str, int]:
+        """
+        Returns a count of all primitives in the top-level circuit (no flattening).
+        For a circuit built by SpiceParser.iter_parse, the counts come from the
+        summaries it recorded while streaming, so a single streaming pass
+        followed by NetlistAnalyzer(parser.circuit).get_stats() is enough.
+        `source` may instead be another Circuit, or a (scope_path, component)
+        stream whose top-level entries are counted on the fly; its subckt
+        instances are classified against this analyzer's definitions.
+        """
+        if isinstance(source, Circuit):
+            comps = source.components
+        elif source is not None:
+            comps = (comp for scope, comp in source if not scope)
+        else:
+            try:
+                comps = self._get_root_components()
+            except ValueError:
+                return {}
+            summary = None if comps else self._root_summary()
+            if summary is not None:
+                return self._summary_stats(summary)
 
-        for comp in comps:
-            stats[self._classify_component(comp)] += 1
+        return dict(Counter(self._classify_component(comp) for comp in comps))
+
+    def _root_summary(self) -> Optional[ScopeSummary]:
+        """The streamed summary of the root scope, if iter_parse recorded one."""
+        streamed = self.circuit.streamed
+        if not streamed:
+            return None
+        if self.top_cell_name:
+            return streamed.get(self.top_cell_name)
+        if self.circuit.name in streamed:
+            return streamed[self.circuit.name]
+        top_subckt = self.find_top_cell()
+        return streamed.get(top_subckt.name) if top_subckt else None
+
+    def _summary_stats(self, summary: ScopeSummary) -> Dict[str, int]:
+        """get_stats() counts from a streamed scope summary."""
+        stats = Counter(summary.primitives)
+        for (sub_name, param_keys), count in summary.instances.items():
+            if sub_name in self._non_leaf:
+                stats["SubcktInstance"] += count
+            else:
+                stats[_classify_leaf(sub_name, param_keys)] += count
         return dict(stats)
 
     def get_hierarchical_stats(self) -> Dict[str, int]:
         """Returns a count of all primitives in the flattened circuit (recursive)."""
-        stats = Counter()
         try:
-            flat_circuit = self.flatten()
-            comps = flat_circuit.components
+            kinds, _ = self._hierarchy_counts()
         except Exception:
             # Fallback or empty if flattening fails
             return {}
 
-        for comp in comps:
-            stats[self._classify_component(comp)] += 1
-        return dict(stats)
+        return dict(kinds)
 
     def print_hierarchy(self):
         """Prints an ASCII tree of the circuit hierarchy (subcircuit instances only)."""
         roots = self._get_root_components()
         root_name = self.top_cell_name if self.top_cell_name else self.circuit.name
-        print(root_name)
+        # Collect the tree and print it in one go
+        lines = [root_name]
 
-        subckt_map = {s.name: s for s in self.circuit.subcircuits}
+        subckt_map = self._subckt_map
+        # Subckt name -> its sorted (instance name, subckt name) children,
+        # so reused subckts are filtered and sorted only once
+        children_cache: Dict[str, Tuple[Tuple[str, str], ...]] = {}
 
-        def _print_level(components, prefix=""):
+        def _child_instances(components) -> Tuple[Tuple[str, str], ...]:
             # Filter for SubcktInstances only to keep tree readable
-            instances = [c for c in components if isinstance(c, SubcktInstance)]
             # Sort by name for consistent output
-            instances.sort(key=lambda x: x.name)
+            return tuple(sorted((c.name, c.subckt_name) for c in components
+                                if isinstance(c, SubcktInstance)))
 
-            for i, inst in enumerate(instances):
+        def _print_level(instances, prefix=""):
+            for i, (inst_name, subckt_name) in enumerate(instances):
                 is_last = (i == len(instances) - 1)
                 connector = "└── " if is_last else "├── "
-                print(f"{prefix}{connector}{inst.name} ({inst.subckt_name})")
+                lines.append(f"{prefix}{connector}{inst_name} ({subckt_name})")
 
                 new_prefix = prefix + ("    " if is_last else "│   ")
                 
-                if inst.subckt_name in subckt_map:
-                    _print_level(subckt_map[inst.subckt_name].components, new_prefix)
+                if subckt_name in subckt_map:
+                    children = children_cache.get(subckt_name)
+                    if children is None:
+                        children = _child_instances(subckt_map[subckt_name].components)
+                        children_cache[subckt_name] = children
+                    _print_level(children, new_prefix)
                 # Else: it's an unresolved subckt or primitive (if we were printing them), nothing to recurse
 
-        _print_level(roots)
+        _print_level(_child_instances(roots))
+        print("\n".join(lines))
 
     def get_top_cells(self) -> List[str]:
         """Returns a list of names of all top-level subcircuits (defined but not instantiated)."""
-        defined_subckts = {s.name for s in self.circuit.subcircuits}
-        instantiated_subckts = set()
-        
-        for s in self.circuit.subcircuits:
-            for comp in s.components:
-                if isinstance(comp, SubcktInstance):
-                    instantiated_subckts.add(comp.subckt_name)
-                    
-        roots = defined_subckts - instantiated_subckts
-        return sorted(list(roots))
+        return list(self._top_cells)
 
     def find_top_cell(self) -> Optional[Subckt]:
         """Heuristic to find the top-level subcircuit if the main circuit is empty."""
-        roots = self.get_top_cells()
-        
-        if len(roots) == 1:
-            root_name = roots[0]
-            return next(s for s in self.circuit.subcircuits if s.name == root_name)
-        
         # If multiple roots, we might want to pick the one with most components? 
         # Or just return None and let user specify (feature for later).
-        # For this task, returning the first root found is a reasonable fallback 
-        # if the list isn't empty, or just failing gracefully.
-        if roots:
-             # Just pick one for now or maybe filtering by name
-             return next(s for s in self.circuit.subcircuits if s.name == roots[0])
+        # For now the first root (by name) is a reasonable fallback.
+        if self._top_cells:
+            return self._subckt_map[self._top_cells[0]]
              
         return None
 
@@ -162,70 +277,23 @@ class NetlistAnalyzer:
         """
         Returns a new Circuit object with all subcircuits recursively flattened.
         Names of components and nodes are prefixed with the instance path.
+
+        The result is computed once and cached on the analyzer, so the
+        source circuit must not be mutated after the analyzer is created.
         """
+        if self._flat_cache is not None:
+            return self._flat_cache
+
         flat_circuit = Circuit(name=self.circuit.name + "_flat")
-        flat_circuit.models = copy.deepcopy(self.circuit.models)
-        
-        # Helper to recursively flatten
-        def _flatten_instance(components: List[Component], path: str):
-            for comp in components:
-                if isinstance(comp, SubcktInstance):
-                    # Find the subckt definition
-                    subckt_def = next((s for s in self.circuit.subcircuits if s.name == comp.subckt_name), None)
-                    if not subckt_def:
-                        # Warning: Subckt not found, treating as a blacklist box
-                        self.unresolved_subckts.add(comp.subckt_name)
-                        # Copy as is or raise error? For now, keep as instance
-                        new_comp = copy.deepcopy(comp)
-                        new_comp.name = f"{path}.{comp.name}" if path else comp.name
-                        flat_circuit.add_component(new_comp)
-                        continue
-
-                    # NEW: Trace empty subcircuits as leaf cells (primitives)
-                    if not subckt_def.components:
-                         new_comp = copy.deepcopy(comp)
-                         new_comp.name = f"{path}.{comp.name}" if path else comp.name
-                         flat_circuit.add_component(new_comp)
-                         continue
-
-                    # Map nodes
-                    # Subckt ports map to Instance nodes
-                    if len(subckt_def.ports) != len(comp.nodes):
-                        # Warning: Port mismatch
-                        pass
-                    
-                    node_map = {}
-                    for port, node in zip(subckt_def.ports, comp.nodes):
-                        node_map[port] = node # Map internal port name to external node name
-                    
-                    # Recursively flatten the subckt's components
-                    # We need to map internal nodes to scoped names, UNLESS they hit a port
-                    
-                    instance_path = f"{path}.{comp.name}" if path else comp.name
-                    
-                    # Pre-process components for node renaming
-                    # Create a deep copy of subckt components to modify
-                    sub_components = copy.deepcopy(subckt_def.components)
-                    
-                    for sub_comp in sub_components:
-                         new_nodes = []
-                         for n in sub_comp.nodes:
-                             if n in node_map:
-                                 new_nodes.append(node_map[n]) # Connected to parent net
-                             elif n == "0" or n.upper() == "GND":
-                                 new_nodes.append("0") # Global GND
-                             else:
-                                 new_nodes.append(f"{instance_path}.{n}") # Internal net
-                         sub_comp.nodes = new_nodes
-                    
-                    # Now recurse
-                    _flatten_instance(sub_components, instance_path)
-
-                else:
-                    # Primitive component
-                    new_comp = copy.deepcopy(comp)
-                    new_comp.name = f"{path}.{comp.name}" if path else comp.name
-                    flat_circuit.add_component(new_comp)
+        flat_circuit.models = self.circuit.models
+        append = flat_circuit.components.append
+
+        # Hot-loop lookups bound to locals
+        clone = _clone_with
+        gnd_nodes = _GND_NODES
+        structural_get = self._structural.get
+        subckt_names = self._subckt_names
+        unresolved_add = self.unresolved_subckts.add
 
         try:
              start_components = self._get_root_components()
@@ -234,52 +302,172 @@ class NetlistAnalyzer:
              # For now let's raise so main() can handle it
              raise e
 
-        _flatten_instance(start_components, "")
+        # Iterative depth-first traversal. Each frame holds the remaining
+        # components of one subckt body, the name prefix of that body (its
+        # instance path plus a trailing dot, empty at the root), its port
+        # map (None at the root, where nodes are kept as-is) and the subckt
+        # name (None at the root).
+        # Subckts open on the stack, to reject recursive instantiation
+        active: set[str] = set()
+        stack = [(iter(start_components), "", None, None)]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            it, prefix, node_map, name = stack[-1]
+            comp = next(it, None)
+            if comp is None:
+                pop()
+                if name is not None:
+                    active.discard(name)
+                continue
+
+            new_name = prefix + comp.name
+
+            # Map nodes into the parent scope
+            # Port -> parent net, global GND -> "0", internal net -> scoped.
+            # Scoped nets are interned: every component on the same internal
+            # net then shares one string, and one object per net is all the
+            # mapped ports further down the hierarchy pass along.
+            if node_map is None:
+                nodes = comp.nodes
+            elif node_map:
+                nodes = tuple([node_map[n] if n in node_map
+                               else "0" if n in gnd_nodes
+                               else intern(prefix + n)
+                               for n in comp.nodes])
+            else:
+                # Port-less subckt: skip the port lookup
+                nodes = tuple(["0" if n in gnd_nodes else intern(prefix + n) for n in comp.nodes])
+
+            if isinstance(comp, SubcktInstance):
+                # Find the subckt definition
+                structural = structural_get(comp.subckt_name)
+                if structural is None:
+                    if comp.subckt_name not in subckt_names:
+                        # Warning: Subckt not found, treating as a blacklist box
+                        unresolved_add(comp.subckt_name)
+
+                    # Unresolved (black box) or empty subckt (leaf cell, traced
+                    # as a primitive): keep the instance itself
+                    append(clone(comp, new_name, nodes))
+                    continue
+
+                ports, sub_components = structural
+
+                # Map nodes
+                # Subckt ports map to Instance nodes
+                if len(ports) != len(nodes):
+                    # Warning: Port mismatch
+                    pass
+
+                # Map internal port name to external node name
+                # (zip truncates to the shorter list on a port mismatch)
+                child_map = dict(zip(ports, nodes))
+
+                sub_name = comp.subckt_name
+                if sub_name in active:
+                    raise ValueError(f"Subckt '{sub_name}' instantiates itself.")
+                active.add(sub_name)
+
+                # Descend into the subckt's components; internal nodes get
+                # scoped names, UNLESS they hit a port
+                push((iter(sub_components), new_name + ".", child_map, sub_name))
+
+            else:
+                # Primitive component
+                append(clone(comp, new_name, nodes))
         
+        self._flat_cache = flat_circuit
         return flat_circuit
 
+    def _count_components(self, components: List[Component],
+                          totals: Dict[str, Tuple[Counter, Counter]]) -> Tuple[Counter, Counter]:
+        """
+        Returns (classification counts, model counts) for a list of components
+        as they would appear after flattening. Structural subckt instances
+        contribute the precomputed totals of their definition.
+        """
+        kinds = Counter()
+        models = Counter()
+        for comp in components:
+            if isinstance(comp, SubcktInstance):
+                if comp.subckt_name in self._structural:
+                    sub_kinds, sub_models = totals[comp.subckt_name]
+                    kinds.update(sub_kinds)
+                    models.update(sub_models)
+                    continue
+
+                if comp.subckt_name not in self._subckt_names:
+                    self.unresolved_subckts.add(comp.subckt_name)
+
+                # Black/leaf box: subckt name stands in for the model
+                kinds[_classify_leaf(comp.subckt_name, frozenset(comp.parameters))] += 1
+                model = comp.model or comp.subckt_name
+            else:
+                comp_type = type(comp)
+                kinds[comp_type.__name__] += 1
+                model = comp.model if comp_type in _MODEL_BEARING else None
+
+            if model:
+                models[model] += 1
+        return kinds, models
+
+    def _hierarchy_counts(self) -> Tuple[Counter, Counter]:
+        """
+        Returns (classification counts, model counts) of the flattened circuit
+        without building it. Each structural subckt is counted once and its
+        totals reused for every instance, so the cost is proportional to the
+        size of the definitions rather than of the flattened netlist.
+        """
+        if self._counts_cache is not None:
+            return self._counts_cache
+
+        root = self._get_root_components()
+
+        # Post-order over the structural subckts reachable from the root, so
+        # every definition is counted after the definitions it instantiates
+        order: List[str] = []
+        done: set[str] = set()
+        active: set[str] = set()
+        stack = [(None, iter(root))]
+        while stack:
+            name, it = stack[-1]
+            comp = next(it, None)
+            if comp is None:
+                stack.pop()
+                if name is not None:
+                    active.discard(name)
+                    done.add(name)
+                    order.append(name)
+                continue
+
+            if isinstance(comp, SubcktInstance):
+                sub_name = comp.subckt_name
+                structural = self._structural.get(sub_name)
+                if structural is None or sub_name in done:
+                    continue
+                if sub_name in active:
+                    raise ValueError(f"Subckt '{sub_name}' instantiates itself.")
+                active.add(sub_name)
+                stack.append((sub_name, iter(structural[1])))
+
+        totals: Dict[str, Tuple[Counter, Counter]] = {}
+        for name in order:
+            totals[name] = self._count_components(self._structural[name][1], totals)
+
+        self._counts_cache = self._count_components(root, totals)
+        return self._counts_cache
+
     def get_transistor_count(self) -> int:
         """Returns total MOSFET + BJT count after flattening."""
-        flat = self.flatten()
-        count = 0
-        for comp in flat.components:
-            classification = self._classify_component(comp)
-            if classification in ("Mosfet", "Bjt"):
-                 count += 1
-        return count
+        kinds, _ = self._hierarchy_counts()
+        return kinds["Mosfet"] + kinds["Bjt"]
 
     def get_model_usage(self) -> Dict[str, int]:
         """Returns a dictionary of model names and their usage count in the flattened netlist."""
-        flat = self.flatten()
-        model_counts = Counter()
-        
-        for comp in flat.components:
-            # Check if component has a 'model' attribute
-            if hasattr(comp, 'model') and comp.model:
-                model_counts[comp.model] += 1
-            elif isinstance(comp, SubcktInstance):
-                # Treat subckt name as model for black/leaf boxes
-                model_counts[comp.subckt_name] += 1
-                
-        return dict(model_counts)
+        _, models = self._hierarchy_counts()
+        return dict(models)
     
     def get_subckts_using_model(self, model_name: str) -> List[str]:
         """Returns a list of subcircuit names that directly instantiate the given model."""
-        using_subckts = set()
-        
-        # Check in all subcircuit definitions
-        for subckt in self.circuit.subcircuits:
-            for comp in subckt.components:
-                if hasattr(comp, 'model') and comp.model == model_name:
-                    using_subckts.add(subckt.name)
-                    break # Found usage in this subckt, move to next
-                    
-        # Also check top level if not empty (and not auto-using top cell)
-        # Note: If find_top_cell logic is used, those are technically in a subckt.
-        # But if the user parses a flat file, we check circuit.components.
-        for comp in self.circuit.components:
-             if hasattr(comp, 'model') and comp.model == model_name:
-                 using_subckts.add(self.circuit.name) 
-                 break
-
-        return sorted(list(using_subckts))
+        return sorted(self._model_to_subckts.get(model_name, ()))
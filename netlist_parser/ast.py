@@ -1,14 +1,38 @@
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Tuple, Union, Any
 
-@dataclass(kw_only=True)
+class _EmptyParameters(dict):
+    """
+    Read-only empty dict shared by all components without parameters. Most
+    R/C/M lines carry none, so they skip a dict each.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared empty parameters are read-only; assign a new dict")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    setdefault = update = pop = popitem = clear = _read_only
+
+    def __reduce__(self):
+        # Unpickles to the shared instance
+        return (_no_parameters, ())
+
+_NO_PARAMETERS = _EmptyParameters()
+
+def _no_parameters() -> Dict[str, Any]:
+    return _NO_PARAMETERS
+
+@dataclass(kw_only=True, slots=True)
 class AstNode:
     """Base class for all AST nodes."""
     source_line: Optional[int] = None
     source_file: Optional[str] = None
-    comments: List[str] = field(default_factory=list)
+    # The parser never fills this; a shared empty tuple avoids a list per node
+    comments: Tuple[str, ...] = ()
 
-@dataclass
+@dataclass(slots=True)
 class Expression(AstNode):
     """Represents a mathematical expression or value."""
     expr_str: str
@@ -16,64 +40,66 @@ class Expression(AstNode):
     def __repr__(self):
         return f"Expr('{self.expr_str}')"
 
-@dataclass
+@dataclass(slots=True)
 class Parameter(AstNode):
     """Represents a parameter definition (param=value)."""
     name: str
     value: Union[str, float, Expression]
 
-@dataclass
+@dataclass(slots=True)
 class Net(AstNode):
     """Represents a connection point (node)."""
     name: str
 
-@dataclass
+@dataclass(slots=True)
 class Component(AstNode):
     """Base class for circuit components (R, C, M, X, etc.)."""
     name: str
-    nodes: List[str]
-    parameters: Dict[str, Union[str, float, Expression]] = field(default_factory=dict)
+    nodes: Tuple[str, ...]
+    # Own dict once the component has a parameter, else the shared read-only
+    # empty one (assign a new dict to add parameters to such a component)
+    parameters: Dict[str, Union[str, float, Expression]] = field(default_factory=_no_parameters)
     model: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Resistor(Component):
     value: Union[str, float, Expression] = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class Capacitor(Component):
     value: Union[str, float, Expression] = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class Inductor(Component):
     value: Union[str, float, Expression] = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class Mosfet(Component):
     model: str = ""  # Model is required for MOSFETs
 
-@dataclass
+@dataclass(slots=True)
 class Bjt(Component):
     model: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class Diode(Component):
     model: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class VoltageSource(Component):
     dc_value: Union[str, float, Expression] = 0.0
     ac_value: Union[str, float, Expression] = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class CurrentSource(Component):
     dc_value: Union[str, float, Expression] = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class SubcktInstance(Component):
     """Instantiates a subcircuit (X element)."""
     subckt_name: str = "" 
 
-@dataclass
+@dataclass(slots=True)
 class Subckt(AstNode):
     """Definition of a subcircuit."""
     name: str
@@ -84,14 +110,27 @@ class Subckt(AstNode):
     def add_component(self, component: Component):
         self.components.append(component)
 
-@dataclass
+@dataclass(slots=True)
 class Model(AstNode):
     """Represents a .MODEL statement."""
     name: str
     model_type: str
     parameters: Dict[str, Union[str, float, Expression]] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
+class ScopeSummary:
+    """
+    What SpiceParser.iter_parse keeps about the components of one scope
+    (a subckt, or the top level) in place of the components themselves.
+    """
+    # Component type name -> count, subckt instances excluded
+    primitives: Counter = field(default_factory=Counter)
+    # (subckt name, parameter names) -> count, enough to classify leaf cells
+    instances: Counter = field(default_factory=Counter)
+    # Device model name -> count
+    models: Counter = field(default_factory=Counter)
+
+@dataclass(slots=True)
 class Circuit(AstNode):
     """Root node of the netlist."""
     name: str
@@ -100,6 +139,9 @@ class Circuit(AstNode):
     models: List[Model] = field(default_factory=list)
     includes: List[str] = field(default_factory=list)
     parameters: Dict[str, Union[str, float, Expression]] = field(default_factory=dict)
+    # Filled by SpiceParser.iter_parse only: scope name (the circuit name at
+    # top level) -> summary of the components streamed from that scope
+    streamed: Dict[str, ScopeSummary] = field(default_factory=dict)
     
     def add_component(self, component: Component):
         self.components.append(component)
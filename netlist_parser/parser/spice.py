@@ -1,94 +1,348 @@
+import gc
+import mmap
 import re
-from typing import List, Optional, Tuple, Iterator
+from contextlib import contextmanager
+from sys import intern
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Iterator
 from .base import BaseParser, Token, ParseError
 from ..ast import (
     Circuit, Subckt, Resistor, Capacitor, Inductor, Mosfet, Bjt, Diode,
-    VoltageSource, CurrentSource, SubcktInstance, Model, Component, Parameter
+    VoltageSource, CurrentSource, SubcktInstance, Model, Component, Parameter,
+    ScopeSummary
 )
-from ..utils import remove_comments, clean_line
+from ..utils import remove_comments, clean_line, tokenize_line
+
+# Buffer size for files that cannot be memory-mapped; a large buffer keeps
+# the number of read syscalls low on big decks.
+_READ_BUFFER_SIZE = 1024 * 1024
+
+def _read_netlist(filepath: str) -> str:
+    """
+    Reads a netlist file into a string.
+    The file is memory-mapped and decoded straight from the mapping, so no
+    intermediate file-sized bytes copy is made. The text layer's newline
+    translation is skipped too (the tokenizer copes with CRLF endings).
+    """
+    with open(filepath, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, 'utf-8', 'replace')
+        except (ValueError, OSError):
+            # Empty files and non-regular files (pipes, ...) can't be mapped
+            return f.read().decode('utf-8', errors='replace')
+
+# .INCLUDE/.LIB lines, for prefetching the files they name
+_INCLUDE_RE = re.compile(r"^[ \t]*\.(?:include|lib)[ \t]+(\S+)", re.IGNORECASE | re.MULTILINE)
+
+# Threads reading include files ahead of the parser
+_INCLUDE_READERS = 8
+
+# .SUBCKT/.ENDS lines, for splitting a deck into top-level subckt regions.
+# A .SUBCKT needs a name, as in parse(); a bare one opens no scope.
+_SUBCKT_BOUNDARY_RE = re.compile(r"^[ \t]*\.(?:(subckt)[ \t]+[^\s$]|ends\b)", re.IGNORECASE | re.MULTILINE)
+
+# Regions handed to each parse_parallel worker task, per worker
+_BATCHES_PER_WORKER = 4
+
+def _subckt_regions(content: str) -> List[Tuple[int, int, int]]:
+    """
+    Returns (start, end, first_line) for each top-level .SUBCKT ... .ENDS
+    block. start/end are offsets of whole lines; nested definitions stay
+    inside their parent's region. An unterminated block runs to the end.
+    """
+    regions = []
+    depth = 0
+    start = line = 0
+    line_pos = 0
+    line_num = 1
+    for m in _SUBCKT_BOUNDARY_RE.finditer(content):
+        if m.group(1):
+            if depth == 0:
+                start = m.start()
+                line_num += content.count('\n', line_pos, start)
+                line_pos = start
+                line = line_num
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                end = content.find('\n', m.end())
+                end = len(content) if end == -1 else end + 1
+                regions.append((start, end, line))
+    if depth:
+        regions.append((start, len(content), line))
+    return regions
+
+@contextmanager
+def _gc_paused():
+    """
+    Pauses the cyclic garbage collector. Building or unpickling millions of
+    AST objects otherwise triggers repeated full-heap collections that cost
+    more than the work itself; the AST holds no reference cycles.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def _parse_regions(filename: str, regions: List[Tuple[int, str]]) -> List[Tuple[List[Subckt], List[Model]]]:
+    """
+    parse_parallel worker: parses each (first_line, text) region on its own.
+    Regions never hold .INCLUDEs, so include state needs no sharing.
+    """
+    parser = SpiceParser()
+    results = []
+    with _gc_paused():
+        for first_line, text in regions:
+            parser._begin(filename, "top")
+            try:
+                parser._process_content(text, filename, first_line)
+            finally:
+                parser._finish()
+            circuit = parser.circuit
+            results.append((circuit.subcircuits, circuit.models))
+    return results
+
+# A '\r' not starting a CRLF pair: a classic Mac (CR-only) line ending
+_LONE_CR_RE = re.compile(r"\r(?!\n)")
+
+def _normalize_newlines(content: str) -> str:
+    """
+    Returns content with CR-only line endings turned into '\n'.
+    CRLF-only content is returned as-is (no copy): the '\r' left at the end
+    of each line is dropped by the comment stripping.
+    """
+    if '\r' in content and _LONE_CR_RE.search(content):
+        return content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+def _with_lower_case(table: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns a copy of an upper-case letter table with lower-case keys added."""
+    return {**table, **{k.lower(): v for k, v in table.items()}}
 
 class SpiceTokenizer:
     """Handles SPICE line continuation and tokenization."""
     
-    def __init__(self, content: str):
-        self.lines = content.splitlines()
-        self.current_line_idx = 0
+    def __init__(self, content: str, first_line: int = 1):
+        self.content = _normalize_newlines(content)
+        # Line number of the first line of content, for slices of a file
+        self.first_line = first_line
 
     def get_logical_lines(self) -> Iterator[Tuple[int, str]]:
         """Yields (line_number, line_content) where logical lines are merged."""
-        buffer = ""
+        # Scans the content in place, one physical line at a time, instead of
+        # holding a splitlines() copy of the whole file. '\r' of CRLF endings
+        # is dropped by the comment stripping.
+        content = self.content
+        length = len(content)
+        pos = 0
+        line_num = self.first_line - 1
+
+        # Pieces of the current logical line, joined once when it is complete
+        parts: List[str] = []
         start_line = 0
         
-        for i, line in enumerate(self.lines):
-            line = remove_comments(line)
-            line = line.rstrip() 
+        while pos < length:
+            end = content.find('\n', pos)
+            if end == -1:
+                end = length
+            line = remove_comments(content[pos:end])
+            pos = end + 1
+            line_num += 1
             
             if not line:
                 continue
                 
-            if line.startswith('+'):
+            if line[0] == '+':
                 # Continuation
-                if buffer:
-                    buffer += " " + line[1:].strip()
-                else:
+                if not parts:
                     # Logic for leading + without previous line (error or ignore?)
                     # For now, treat as error or just start new line
-                    buffer = line[1:].strip()
-                    start_line = i + 1
+                    start_line = line_num
+                parts.append(line[1:].strip())
             else:
                 # Yield previous buffer
-                if buffer:
-                    yield start_line, buffer
-                buffer = line.strip()
-                start_line = i + 1
+                if parts:
+                    yield start_line, " ".join(parts)
+                parts = [line.rstrip()]
+                start_line = line_num
         
-        if buffer:
-            yield start_line, buffer
+        if parts:
+            yield start_line, " ".join(parts)
+
+    def get_logical_tokens(self) -> Iterator[Tuple[int, List[str]]]:
+        """Yields (line_number, tokens) for each non-empty logical line."""
+        # One tokenizer pass per logical line, after comments are stripped and
+        # continuations merged, so quoted expressions may span '+' lines
+        for line_num, line in self.get_logical_lines():
+            tokens = tokenize_line(line)
+            if tokens:
+                yield line_num, tokens
 
 class SpiceParser(BaseParser):
     def parse_file(self, filepath: str) -> Circuit:
         import os
         name = os.path.splitext(os.path.basename(filepath))[0]
-        with open(filepath, 'r') as f:
-            content = f.read()
+        content = _read_netlist(filepath)
         return self.parse(content, filename=filepath, circuit_name=name)
 
     def parse(self, content: str, filename: str = "<string>", circuit_name: str = "top") -> Circuit:
+        self._begin(filename, circuit_name)
+        try:
+            self._process_content(content, filename)
+        finally:
+            self._finish()
+        
+        return self.circuit
+
+    def iter_parse(self, content: str, filename: str = "<string>",
+                   circuit_name: str = "top") -> Iterator[Tuple[Tuple[str, ...], Component]]:
+        """
+        Streaming variant of parse(): yields (scope_path, component) as each
+        component is parsed instead of storing it in its scope, so memory stays
+        flat on very large decks. scope_path holds the names of the enclosing
+        .SUBCKT definitions, () at top level. Subckt definitions (without
+        components), models, params and includes are still recorded on
+        self.circuit, along with a per-scope summary of the streamed
+        components (circuit.streamed) from which NetlistAnalyzer computes
+        top-level stats, top cells and model users without the components.
+        """
+        self._begin(filename, circuit_name)
+        self._sink = sink = []
+        try:
+            for _ in self._iter_content(content, filename):
+                if sink:
+                    yield from sink
+                    sink.clear()
+        finally:
+            self._finish()
+
+    def parse_parallel(self, content: str, filename: str = "<string>", circuit_name: str = "top",
+                       workers: Optional[int] = None) -> Circuit:
+        """
+        Like parse(), but top-level .SUBCKT ... .ENDS blocks are parsed in a
+        process pool. The rest of the deck (models, params, includes,
+        top-level components) is parsed here, and worker results are spliced
+        in at their position, so the circuit matches parse() output. Blocks
+        containing .INCLUDE/.LIB are parsed here too, in order, so included
+        files are de-duplicated exactly as in parse(). Worth it for large
+        decks dominated by subckt bodies; decks with fewer than two
+        offloadable blocks are parsed inline.
+        """
+        import os
+        content = _normalize_newlines(content)
+        regions = [region for region in _subckt_regions(content)
+                   if not _INCLUDE_RE.search(content, region[0], region[1])]
+        workers = workers or os.cpu_count() or 1
+        if workers < 2 or len(regions) < 2:
+            return self.parse(content, filename=filename, circuit_name=circuit_name)
+
+        # Group consecutive regions into batches of roughly equal text size,
+        # to amortize per-task pickling
+        target = sum(end - start for start, end, _ in regions) // (workers * _BATCHES_PER_WORKER) + 1
+        batches: List[List[Tuple[int, int, int]]] = []
+        batch: List[Tuple[int, int, int]] = []
+        size = 0
+        for region in regions:
+            batch.append(region)
+            size += region[1] - region[0]
+            if size >= target:
+                batches.append(batch)
+                batch = []
+                size = 0
+        if batch:
+            batches.append(batch)
+
+        self._begin(filename, circuit_name)
+        circuit = self.circuit
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_parse_regions, filename,
+                                [(line, content[start:end]) for start, end, line in batch])
+                    for batch in batches
+                ]
+                # Parse the text between regions in order, splicing each
+                # region's definitions in where it stood
+                pos = 0
+                line_num = 1
+                for batch, future in zip(batches, futures):
+                    for (start, end, line), (subckts, models) in zip(batch, future.result()):
+                        self._process_content(content[pos:start], filename, line_num)
+                        circuit.subcircuits.extend(subckts)
+                        circuit.models.extend(models)
+                        pos = end
+                        line_num = line + content.count('\n', start, end)
+                self._process_content(content[pos:], filename, line_num)
+        finally:
+            self._finish()
+
+        return circuit
+
+    def _begin(self, filename: str, circuit_name: str):
         import os
         self.circuit = Circuit(name=circuit_name)
         self.current_scope = self.circuit 
         self.scope_stack = []
+        self._scope_path: Tuple[str, ...] = ()
+        # Streamed (scope_path, component) pairs; None stores into scopes
+        self._sink: Optional[List[Tuple[Tuple[str, ...], Component]]] = None
+        # Include read by _handle_include, processed by _iter_content
+        self._next_include: Optional[Tuple[str, str]] = None
         
         # Track visited files to prevent cyclic includes
         # Store absolute paths
         abs_path = os.path.abspath(filename)
         self.visited_files = {abs_path}
 
-        self._process_content(content, filename)
-        
-        return self.circuit
+        # Background reads of include files, started ahead of their .INCLUDE
+        self._include_reader: Optional[ThreadPoolExecutor] = None
+        self._pending_reads: Dict[str, Future] = {}
 
-    def _process_content(self, content: str, file_path: str):
-        tokenizer = SpiceTokenizer(content)
+    def _finish(self):
+        if self._include_reader is not None:
+            self._include_reader.shutdown(wait=True, cancel_futures=True)
+        self._include_reader = None
+        self._pending_reads = {}
+        self._sink = None
+
+    def _process_content(self, content: str, file_path: str, first_line: int = 1):
+        for _ in self._iter_content(content, file_path, first_line):
+            pass
+
+    def _iter_content(self, content: str, file_path: str, first_line: int = 1) -> Iterator[None]:
+        # Yields after every logical line so iter_parse can drain its sink;
+        # includes are walked in place, streaming their lines as well
+        self._prefetch_includes(content, file_path)
+        tokenizer = SpiceTokenizer(content, first_line)
         
-        for line_num, line in tokenizer.get_logical_lines():
+        for line_num, tokens in tokenizer.get_logical_tokens():
             try:
-                self._parse_line(line, line_num, file_path)
+                self._parse_line(tokens, line_num, file_path)
             except Exception as e:
-                print(f"Warning: Failed to parse line {line_num} in {file_path}: {line}. Error: {e}")
+                print(f"Warning: Failed to parse line {line_num} in {file_path}: {' '.join(tokens)}. Error: {e}")
 
-    def _parse_line(self, line: str, line_num: int, file_path: str):
-        from ..utils import tokenize_line
-        tokens = tokenize_line(line)
-        if not tokens:
-            return
+            include = self._next_include
+            if include is not None:
+                self._next_include = None
+                target_path, include_content = include
+                yield from self._iter_content(include_content, target_path)
+                # Add to list for record keeping
+                self.circuit.includes.append(target_path)
+            yield
 
-        cmd = tokens[0].upper()
+    def _parse_line(self, tokens: List[str], line_num: int, file_path: str):
+        name = tokens[0]
 
-        if cmd.startswith('.'):
-            self._parse_dot_command(cmd, tokens, line_num, file_path)
+        # Only dot commands are case-folded; component names keep their case
+        if name[0] == '.':
+            self._parse_dot_command(name.upper(), tokens, line_num, file_path)
         else:
-            self._parse_component(cmd, tokens, line_num)
+            self._parse_component(name, tokens, line_num)
 
     def _parse_dot_command(self, cmd: str, tokens: List[str], line_num: int, file_path: str):
         if cmd == '.SUBCKT':
@@ -97,12 +351,10 @@ class SpiceParser(BaseParser):
             self._end_subckt()
         elif cmd == '.MODEL':
             self._parse_model(tokens)
-        elif cmd == '.INCLUDE' or cmd == '.LIB':
+        elif cmd in ('.INCLUDE', '.LIB'):
             if len(tokens) > 1:
                 include_path = tokens[1]
                 # For .LIB, typically .lib "path" entry_name. We just include the whole file for now.
-                # Remove quotes if present
-                include_path = include_path.strip('"').strip("'")
                 self._handle_include(include_path, file_path)
         elif cmd == '.PARAM':
             self._parse_param(tokens)
@@ -110,17 +362,42 @@ class SpiceParser(BaseParser):
             # Other commands (.TRAN, .OP, etc.) - ignore for netlist parsing
             pass
 
-    def _handle_include(self, include_path: str, current_file_path: str):
+    def _resolve_include(self, include_path: str, current_file_path: str) -> str:
         import os
         
-        # Resolve path
+        # Remove quotes if present
+        include_path = include_path.strip('"').strip("'")
         if os.path.isabs(include_path):
             target_path = include_path
         else:
             current_dir = os.path.dirname(os.path.abspath(current_file_path))
             target_path = os.path.join(current_dir, include_path)
             
-        target_path = os.path.abspath(target_path)
+        return os.path.abspath(target_path)
+
+    def _prefetch_includes(self, content: str, file_path: str):
+        """
+        Starts reading the files included by `content` on a thread pool, so
+        decks with many library includes overlap their file I/O. The files
+        are still parsed in place, in order, when their .INCLUDE line is
+        reached; a prefetched path that is never used is just dropped.
+        """
+        import os
+
+        for match in _INCLUDE_RE.finditer(content):
+            target_path = self._resolve_include(match.group(1), file_path)
+            if (target_path in self.visited_files or target_path in self._pending_reads
+                    or not os.path.isfile(target_path)):
+                continue
+            if self._include_reader is None:
+                self._include_reader = ThreadPoolExecutor(max_workers=_INCLUDE_READERS)
+            self._pending_reads[target_path] = self._include_reader.submit(_read_netlist, target_path)
+
+    def _handle_include(self, include_path: str, current_file_path: str):
+        import os
+        
+        # Resolve path
+        target_path = self._resolve_include(include_path, current_file_path)
         
         if target_path in self.visited_files:
             return # Cycle or duplicate include detected
@@ -132,20 +409,20 @@ class SpiceParser(BaseParser):
         self.visited_files.add(target_path)
         
         try:
-            with open(target_path, 'r') as f:
-                content = f.read()
-            # Recursively process
-            self._process_content(content, target_path)
-            # Add to list for record keeping
-            self.circuit.includes.append(target_path)
+            pending = self._pending_reads.pop(target_path, None)
+            content = pending.result() if pending is not None else _read_netlist(target_path)
+            # Processed by _iter_content once this line is done
+            self._next_include = (target_path, content)
         except Exception as e:
             print(f"Warning: Failed to read include file {target_path}: {e}")
 
     def _parse_param(self, tokens: List[str]):
         # tokens[0] is .PARAM
+        # Circuit and Subckt both carry a parameters dict
+        params = self.current_scope.parameters
         for t in tokens[1:]:
-            if '=' in t:
-                k, v = t.split('=', 1)
+            k, sep, v = t.partition('=')
+            if sep:
                 # Helper to strip parens/quotes if desired, but for AST usually keep them
                 # Just strip outer quotes if they exist? 
                 # HSPICE: w='1+1'. AST: "1+1" or "'1+1'"?
@@ -153,8 +430,7 @@ class SpiceParser(BaseParser):
                 if v.startswith("'") and v.endswith("'"):
                     v = v[1:-1]
                 
-                if hasattr(self.current_scope, 'parameters'):
-                    self.current_scope.parameters[k] = v
+                params[k] = v
 
     def _start_subckt(self, tokens: List[str]):
         if len(tokens) < 2:
@@ -167,8 +443,8 @@ class SpiceParser(BaseParser):
         
         # Simple param extraction from port list if they look like p=v
         for t in ports:
-            if '=' in t:
-                k, v = t.split('=', 1)
+            k, sep, v = t.partition('=')
+            if sep:
                 params[k] = v
             else:
                 cleaned_ports.append(t)
@@ -179,10 +455,12 @@ class SpiceParser(BaseParser):
         # Push current scope
         self.scope_stack.append(self.current_scope)
         self.current_scope = subckt
+        self._scope_path += (name,)
 
     def _end_subckt(self):
         if self.scope_stack:
             self.current_scope = self.scope_stack.pop()
+            self._scope_path = self._scope_path[:-1]
 
     def _parse_model(self, tokens: List[str]):
         if len(tokens) < 3:
@@ -192,8 +470,8 @@ class SpiceParser(BaseParser):
         # Parse rest as params
         params = {}
         for t in tokens[3:]:
-            if '=' in t:
-                k, v = t.split('=', 1)
+            k, sep, v = t.partition('=')
+            if sep:
                 # Helper to strip parens if present
                 v = v.strip('()')
                 params[k] = v
@@ -204,134 +482,150 @@ class SpiceParser(BaseParser):
         self.circuit.add_model(model)
 
     def _parse_component(self, name: str, tokens: List[str], line_num: int):
-        # Basic SPICE first letter detection
-        first_char = name[0].upper()
-        
-        # Helper to extract nodes and params
-        # This is non-trivial for generic spice as node count varies.
-        # We'll use basic heuristics.
-        
-        comp = None
-        nodes = []
-        params = {}
-        model_name = None
-        val_idx = -1 
-        
-        # Common pattern: Name Node1 Node2 ... [Value/Model] [Params]
-        
-        if first_char == 'R':
-            # Rname N1 N2 Value
-            nodes = tokens[1:3]
-            value = tokens[3] if len(tokens) > 3 else "0"
-            comp = Resistor(name=name, nodes=nodes, value=value)
-            val_idx = 4
-            
-        elif first_char == 'C':
-             # Cname N1 N2 Value
-            nodes = tokens[1:3]
-            value = tokens[3] if len(tokens) > 3 else "0"
-            comp = Capacitor(name=name, nodes=nodes, value=value)
-            val_idx = 4
-
-        elif first_char == 'L':
-             # Lname N1 N2 Value
-            nodes = tokens[1:3]
-            value = tokens[3] if len(tokens) > 3 else "0"
-            comp = Inductor(name=name, nodes=nodes, value=value)
-            val_idx = 4
-            
-        elif first_char == 'M':
-            # Mname D G S B Model [L=... W=...]
-            # MOSFET usually has 4 nodes
-            nodes = tokens[1:5]
-            model_name = tokens[5]
-            comp = Mosfet(name=name, nodes=nodes, model=model_name)
-            val_idx = 6
-
-        elif first_char == 'Q':
-            # Qname C B E [S] Model
-            # BJT usually 3 or 4 nodes
-            # Heuristic: check if token 4 is a model or node
-            # Ideally need to know if 4th token is model name. 
-            # For now assume 3 nodes default.
-            nodes = tokens[1:4]
-            model_name = tokens[4]
-            comp = Bjt(name=name, nodes=nodes, model=model_name)
-            val_idx = 5
-
-        elif first_char == 'D':
-            # Dname N+ N- Model
-            nodes = tokens[1:3]
-            model_name = tokens[3]
-            comp = Diode(name=name, nodes=nodes, model=model_name)
-            val_idx = 4
-            
-        elif first_char == 'X':
-            # Xname N1 N2 ... SubcktName
-            # Xname N1 N2 ... / SubcktName params... (CDL style)
-            
-            if '/' in tokens:
-                try:
-                    slash_idx = tokens.index('/')
-                    nodes = tokens[1:slash_idx]
-                    # Subckt name is after slash
-                    if slash_idx + 1 < len(tokens):
-                        subckt_name = tokens[slash_idx + 1]
-                        val_idx = slash_idx + 2
-                    else:
-                        raise ValueError("Missing subckt name after /")
-                except ValueError:
-                    # Logic error handling
-                    return
-            else:
-                # Standard SPICE
-                # The last non-param token is usually the subckt name
-                # This is tricky. We'll scan from end for Params, then last is subckt
-                
-                # Simple heuristic: Split by '=' to find first param
-                # The token BEFORE the first param is likely the subckt name
-                # If no params, the last token is subckt name.
-                
-                param_start_index = len(tokens)
-                for i, t in enumerate(tokens):
-                     if '=' in t:
-                         param_start_index = i
-                         break
-                
-                subckt_name = tokens[param_start_index - 1]
-                nodes = tokens[1:param_start_index - 1]
-                val_idx = param_start_index
-            
-            comp = SubcktInstance(name=name, nodes=nodes, subckt_name=subckt_name)
-
-        elif first_char == 'V':
-             # Vname N+ N- [DC Value] [AC Value]
-             nodes = tokens[1:3]
-             # Simplify: take 4th token as DC value
-             value = tokens[3] if len(tokens) > 3 else "0"
-             comp = VoltageSource(name=name, nodes=nodes, dc_value=value)
-             val_idx = 4
-
-        elif first_char == 'I':
-             nodes = tokens[1:3]
-             value = tokens[3] if len(tokens) > 3 else "0"
-             comp = CurrentSource(name=name, nodes=nodes, dc_value=value)
-             val_idx = 4
+        # Basic SPICE first letter detection, dispatched through a table
+        # instead of an if/elif chain
+        handler = self._COMPONENT_PARSERS.get(name[0])
+        if handler is None:
+            return
+
+        # Each handler returns the component plus the index of the first
+        # trailing parameter token, or None if the line is unusable
+        parsed = handler(self, name, tokens)
+        if parsed is None:
+            return
+        comp, val_idx = parsed
              
         # Parse remaining tokens as parameters
-        if comp:
-            if val_idx != -1:
-                remaining = tokens[val_idx:]
-                for piece in remaining:
-                    if '=' in piece:
-                        k, v = piece.split('=', 1)
-                        comp.parameters[k] = v
-                    else:
-                        # Handle standalone flags or unparsed params
-                        if 'params' not in comp.parameters:
-                            comp.parameters['extra'] = []
-                        if isinstance(comp.parameters.get('extra'), list):
-                             comp.parameters['extra'].append(piece)
-
-            comp.source_line = line_num
+        # key=value tokens are split with one partition() scan each
+        remaining = tokens[val_idx:]
+        if remaining:
+            # Components without parameters keep the shared empty dict
+            params = comp.parameters = {}
+            for piece in remaining:
+                k, sep, v = piece.partition('=')
+                if sep:
+                    params[intern(k)] = v
+                else:
+                    # Handle standalone flags or unparsed params
+                    if 'params' not in params:
+                        params['extra'] = []
+                    if isinstance(params.get('extra'), list):
+                         params['extra'].append(piece)
+
+        comp.source_line = line_num
+        if self._sink is not None:
+            self._sink.append((self._scope_path, comp))
+            self._summarize(comp)
+        else:
             self.current_scope.add_component(comp)
+
+    def _summarize(self, comp: Component):
+        # Streaming keeps no components, so record per scope what the
+        # analyzer needs to classify instances and find top cells
+        streamed = self.circuit.streamed
+        scope_name = self.current_scope.name
+        summary = streamed.get(scope_name)
+        if summary is None:
+            summary = streamed[scope_name] = ScopeSummary()
+        if isinstance(comp, SubcktInstance):
+            summary.instances[comp.subckt_name, frozenset(comp.parameters)] += 1
+        else:
+            summary.primitives[type(comp).__name__] += 1
+        if comp.model:
+            summary.models[comp.model] += 1
+
+    # Common pattern: Name Node1 Node2 ... [Value/Model] [Params]
+    # Node counts vary by element, so each letter uses basic heuristics.
+    # Node, model and subckt names are interned: a handful of nets and
+    # models recur across millions of components, so the AST then holds one
+    # string per distinct name. Component names are unique and left alone.
+
+    def _parse_rcl(self, name: str, tokens: List[str]) -> Tuple[Component, int]:
+        # Rname N1 N2 Value (same for C and L)
+        nodes = tuple(map(intern, tokens[1:3]))
+        value = tokens[3] if len(tokens) > 3 else "0"
+        comp_class = self._PASSIVE_CLASSES[name[0]]
+        return comp_class(name=name, nodes=nodes, value=value), 4
+
+    def _parse_mosfet(self, name: str, tokens: List[str]) -> Tuple[Component, int]:
+        # Mname D G S B Model [L=... W=...]
+        # MOSFET usually has 4 nodes
+        nodes = tuple(map(intern, tokens[1:5]))
+        model_name = intern(tokens[5])
+        return Mosfet(name=name, nodes=nodes, model=model_name), 6
+
+    def _parse_bjt(self, name: str, tokens: List[str]) -> Tuple[Component, int]:
+        # Qname C B E [S] Model
+        # BJT usually 3 or 4 nodes
+        # Heuristic: check if token 4 is a model or node
+        # Ideally need to know if 4th token is model name. 
+        # For now assume 3 nodes default.
+        nodes = tuple(map(intern, tokens[1:4]))
+        model_name = intern(tokens[4])
+        return Bjt(name=name, nodes=nodes, model=model_name), 5
+
+    def _parse_diode(self, name: str, tokens: List[str]) -> Tuple[Component, int]:
+        # Dname N+ N- Model
+        nodes = tuple(map(intern, tokens[1:3]))
+        model_name = intern(tokens[3])
+        return Diode(name=name, nodes=nodes, model=model_name), 4
+
+    def _parse_subckt_instance(self, name: str, tokens: List[str]) -> Optional[Tuple[Component, int]]:
+        # Xname N1 N2 ... SubcktName
+        # Xname N1 N2 ... / SubcktName params... (CDL style)
+        
+        # Single scan for whichever comes first: the CDL '/' separator or
+        # the first param (token containing '=')
+        slash_idx = -1
+        param_start_index = len(tokens)
+        for i, t in enumerate(tokens):
+            if t == '/':
+                slash_idx = i
+                break
+            if '=' in t:
+                param_start_index = i
+                break
+
+        if slash_idx != -1:
+            nodes = tuple(map(intern, tokens[1:slash_idx]))
+            # Subckt name is after slash
+            if slash_idx + 1 >= len(tokens):
+                # Missing subckt name after /
+                return None
+            subckt_name = intern(tokens[slash_idx + 1])
+            val_idx = slash_idx + 2
+        else:
+            # Standard SPICE
+            # The last non-param token is usually the subckt name
+            # Simple heuristic: the token BEFORE the first param is likely
+            # the subckt name. If no params, the last token is subckt name.
+            subckt_name = intern(tokens[param_start_index - 1])
+            nodes = tuple(map(intern, tokens[1:param_start_index - 1]))
+            val_idx = param_start_index
+        
+        return SubcktInstance(name=name, nodes=nodes, subckt_name=subckt_name), val_idx
+
+    def _parse_source(self, name: str, tokens: List[str]) -> Tuple[Component, int]:
+        # Vname N+ N- [DC Value] [AC Value] (same for I)
+        nodes = tuple(map(intern, tokens[1:3]))
+        # Simplify: take 4th token as DC value
+        value = tokens[3] if len(tokens) > 3 else "0"
+        comp_class = self._SOURCE_CLASSES[name[0]]
+        return comp_class(name=name, nodes=nodes, dc_value=value), 4
+
+    # Letter tables hold both cases, so lookups need no upper()
+    _PASSIVE_CLASSES = _with_lower_case({'R': Resistor, 'C': Capacitor, 'L': Inductor})
+    _SOURCE_CLASSES = _with_lower_case({'V': VoltageSource, 'I': CurrentSource})
+
+    # First letter -> component parser
+    _COMPONENT_PARSERS = _with_lower_case({
+        'R': _parse_rcl,
+        'C': _parse_rcl,
+        'L': _parse_rcl,
+        'M': _parse_mosfet,
+        'Q': _parse_bjt,
+        'D': _parse_diode,
+        'X': _parse_subckt_instance,
+        'V': _parse_source,
+        'I': _parse_source,
+    })
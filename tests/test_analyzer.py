@@ -33,7 +33,7 @@ class TestAnalyzer(unittest.TestCase):
         m1 = flat.components[0]
         self.assertEqual(m1.name, "X1.M1")
         # Nodes: out->b, in->a, 0->0, 0->0
-        self.assertEqual(m1.nodes, ["b", "a", "0", "0"])
+        self.assertEqual(m1.nodes, ("b", "a", "0", "0"))
 
     def test_flatten_nested(self):
         netlist = """
@@ -75,7 +75,79 @@ class TestAnalyzer(unittest.TestCase):
         # R1 in leaf connects p1 p2.
         # X1 connects a(in) mid(Xtop.mid).
         # So Xtop.X1.R1 nodes should be ['in', 'Xtop.mid']
-        self.assertEqual(comp1.nodes, ['in', 'Xtop.mid'])
+        self.assertEqual(comp1.nodes, ('in', 'Xtop.mid'))
+
+    def test_flatten_deep_hierarchy(self):
+        # Deeper than the default Python recursion limit
+        depth = 1500
+        lines = [".subckt c0 a b", "R1 a b 100", ".ends"]
+        for i in range(1, depth):
+            lines += [f".subckt c{i} a b", f"X1 a b c{i - 1}", ".ends"]
+        lines.append(f"Xtop in out c{depth - 1}")
+        circuit = self.parser.parse("\n".join(lines))
+        analyzer = NetlistAnalyzer(circuit)
+        flat = analyzer.flatten()
+
+        self.assertEqual(len(flat.components), 1)
+        self.assertEqual(flat.components[0].nodes, ("in", "out"))
+
+    def test_flatten_cached(self):
+        netlist = """
+        .subckt inv in out
+        M1 out in 0 0 nmos
+        .ends
+
+        X1 a b inv
+        """
+        circuit = self.parser.parse(netlist)
+        analyzer = NetlistAnalyzer(circuit)
+        # Repeated queries reuse the same flattened circuit
+        self.assertIs(analyzer.flatten(), analyzer.flatten())
+
+    def test_flatten_recursive_subckt(self):
+        netlist = """
+        .subckt a p
+        R1 p q 1
+        Xa q a
+        .ends
+        .subckt b p
+        Xc p c
+        .ends
+        .subckt c p
+        Xb p b
+        .ends
+        """
+        circuit = self.parser.parse(netlist)
+        # Direct and indirect self-instantiation are rejected, not looped on
+        for top in ("a", "b"):
+            with self.assertRaises(ValueError):
+                NetlistAnalyzer(circuit, top_cell_name=top).flatten()
+            # The flattened counts reject it too
+            with self.assertRaises(ValueError):
+                NetlistAnalyzer(circuit, top_cell_name=top).get_transistor_count()
+            with self.assertRaises(ValueError):
+                NetlistAnalyzer(circuit, top_cell_name=top).get_model_usage()
+
+    def test_top_cells(self):
+        netlist = """
+        .subckt inv in out
+        M1 out in 0 0 nmos
+        .ends
+
+        .subckt buf in out
+        X1 in mid inv
+        X2 mid out inv
+        .ends
+
+        .subckt spare a b
+        R1 a b 1k
+        .ends
+        """
+        circuit = self.parser.parse(netlist)
+        analyzer = NetlistAnalyzer(circuit)
+
+        self.assertEqual(analyzer.get_top_cells(), ["buf", "spare"])
+        self.assertEqual(analyzer.find_top_cell().name, "buf")
 
     def test_model_usage(self):
         netlist = """
@@ -97,5 +169,54 @@ class TestAnalyzer(unittest.TestCase):
         self.assertEqual(usage["nmos_vtg"], 2) # X1.M1, X2.M1
         self.assertEqual(usage["pmos_vtg"], 2) # X1.M2, X2.M2
 
+    def test_counts_match_flatten(self):
+        netlist = """
+        .subckt inv in out
+        M1 out in 0 0 nmos_vtg
+        M2 out in 1 1 pmos_vtg
+        .ends
+
+        .subckt buf in out
+        X1 in mid inv
+        X2 mid out inv
+        Xcap mid 0 decap
+        .ends
+
+        X1 a b buf
+        X2 b c buf
+        X3 c d inv
+        """
+        circuit = self.parser.parse(netlist)
+        analyzer = NetlistAnalyzer(circuit)
+
+        # Counting does not need the flattened circuit
+        self.assertEqual(analyzer.get_transistor_count(), 10)
+        self.assertEqual(analyzer.get_hierarchical_stats(), {"Mosfet": 10, "SubcktInstance": 2})
+        self.assertEqual(analyzer.get_model_usage(), {"nmos_vtg": 5, "pmos_vtg": 5, "decap": 2})
+        self.assertEqual(analyzer.unresolved_subckts, {"decap"})
+
+        flat = analyzer.flatten()
+        self.assertEqual(len(flat.components), 12)
+
+    def test_subckts_using_model(self):
+        netlist = """
+        .subckt inv in out
+        M1 out in 0 0 nmos_vtg
+        M2 out in 1 1 pmos_vtg
+        .ends
+
+        .subckt pulldown a
+        M1 a a 0 0 nmos_vtg
+        .ends
+
+        M9 d g s b nmos_vtg
+        """
+        circuit = self.parser.parse(netlist)
+        analyzer = NetlistAnalyzer(circuit)
+
+        self.assertEqual(analyzer.get_subckts_using_model("nmos_vtg"), ["inv", "pulldown", "top"])
+        self.assertEqual(analyzer.get_subckts_using_model("pmos_vtg"), ["inv"])
+        self.assertEqual(analyzer.get_subckts_using_model("missing"), [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -10,6 +10,17 @@ class TestHspice(unittest.TestCase):
         m1 = circuit.components[0]
         self.assertEqual(m1.parameters['w'], "'1u + 2u'")
 
+    def test_quoted_expression_across_continuation(self):
+        content = """
+        M1 d g s b nmos w='1u +
+        + 2u' l=1u
+        """
+        parser = SpiceParser()
+        circuit = parser.parse(content)
+        m1 = circuit.components[0]
+        self.assertEqual(m1.parameters['w'], "'1u + 2u'")
+        self.assertEqual(m1.parameters['l'], '1u')
+
     def test_param_parsing(self):
         content = """
         .PARAM width=1u length='0.18u * 2'
@@ -50,5 +50,41 @@ class TestInclude(unittest.TestCase):
         # Path will be absolute
         self.assertTrue(any("sub.sp" in p for p in circuit.includes))
 
+    def test_multiple_and_nested_includes(self):
+        # top2.sp -> includes lib_a.sp and lib_b.sp
+        # lib_b.sp -> includes lib_c.sp
+        files = {
+            "lib_a.sp": ".subckt cell_a A B\nR1 A B 1k\n.ends\n",
+            "lib_b.sp": ".include 'lib_c.sp'\n.subckt cell_b A B\nXc A B cell_c\n.ends\n",
+            "lib_c.sp": ".subckt cell_c A B\nC1 A B 1p\n.ends\n",
+            "top2.sp": ".include 'lib_a.sp'\n.INCLUDE \"lib_b.sp\"\nX1 1 0 cell_a\nX2 1 0 cell_b\n",
+        }
+        for name, content in files.items():
+            with open(name, "w") as f:
+                f.write(content)
+            self.test_files.append(name)
+
+        circuit = self.parser.parse_file("top2.sp")
+
+        # Included content is parsed in include order
+        self.assertEqual([s.name for s in circuit.subcircuits], ["cell_a", "cell_c", "cell_b"])
+        self.assertEqual([os.path.basename(p) for p in circuit.includes], ["lib_a.sp", "lib_c.sp", "lib_b.sp"])
+        self.assertEqual(len(circuit.components), 2)
+
+    def test_parse_parallel_includes_once(self):
+        with open("lib_p.sp", "w") as f:
+            f.write(".subckt lib A B\nR1 A B 1k\n.ends\n")
+        self.test_files.append("lib_p.sp")
+        content = (".subckt s1 A B\n.include 'lib_p.sp'\nX1 A B lib\n.ends\n"
+                   ".subckt s2 A B\nC1 A B 1p\n.ends\n"
+                   ".subckt s3 A B\nC1 A B 1p\n.ends\n"
+                   ".include 'lib_p.sp'\nX1 1 0 s2\n")
+
+        serial = self.parser.parse(content, filename="top_p.sp")
+        parallel = SpiceParser().parse_parallel(content, filename="top_p.sp", workers=2)
+
+        self.assertEqual([s.name for s in parallel.subcircuits], ["s1", "lib", "s2", "s3"])
+        self.assertEqual(parallel, serial)
+
 if __name__ == '__main__':
     unittest.main()
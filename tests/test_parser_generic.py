@@ -1,6 +1,7 @@
 import unittest
 from netlist_parser.parser.spice import SpiceParser
 from netlist_parser.ast import Resistor, Mosfet, SubcktInstance, Subckt
+from netlist_parser.analyzer import NetlistAnalyzer
 
 class TestSpiceParser(unittest.TestCase):
     def setUp(self):
@@ -20,13 +21,15 @@ class TestSpiceParser(unittest.TestCase):
         r1 = circuit.components[0]
         self.assertIsInstance(r1, Resistor)
         self.assertEqual(r1.name, "R1")
-        self.assertEqual(r1.nodes, ["1", "0"])
+        self.assertEqual(r1.nodes, ("1", "0"))
         self.assertEqual(r1.value, "1k")
+        self.assertEqual(r1.parameters, {})
+        self.assertIsNone(r1.parameters.get("m"))
         
         m1 = circuit.components[1]
         self.assertIsInstance(m1, Mosfet)
         self.assertEqual(m1.name, "M1")
-        self.assertEqual(m1.nodes, ["d", "g", "s", "b"])
+        self.assertEqual(m1.nodes, ("d", "g", "s", "b"))
         self.assertEqual(m1.model, "nmos")
         self.assertEqual(m1.parameters["l"], "1u")
         self.assertEqual(m1.parameters["w"], "2u")
@@ -52,7 +55,7 @@ class TestSpiceParser(unittest.TestCase):
         x1 = circuit.components[0]
         self.assertIsInstance(x1, SubcktInstance)
         self.assertEqual(x1.subckt_name, "inv")
-        self.assertEqual(x1.nodes, ["a", "b", "vdd", "0"])
+        self.assertEqual(x1.nodes, ("a", "b", "vdd", "0"))
 
     def test_continuation_line(self):
         netlist = """
@@ -65,5 +68,113 @@ class TestSpiceParser(unittest.TestCase):
         self.assertEqual(m1.parameters["l"], "1u")
         self.assertEqual(m1.parameters["w"], "2u")
 
+    def test_crlf_and_source_lines(self):
+        netlist = "* header\r\nR1 1 0 1k $ load\r\n+ m=2\r\n\r\nC1 1 0 1p\r\n"
+        circuit = self.parser.parse(netlist)
+
+        r1, c1 = circuit.components
+        self.assertEqual(r1.value, "1k")
+        self.assertEqual(r1.parameters["m"], "2")
+        self.assertEqual(r1.source_line, 2)
+        self.assertEqual(c1.nodes, ("1", "0"))
+        self.assertEqual(c1.source_line, 5)
+
+        # CR-only (classic Mac) line endings, alone or mixed with CRLF
+        for netlist, c1_line in (("R1 a b 1k\rC1 a b 1p\r", 2), ("R1 a b 1k\r\n+ m=2\rC1 a b 1p", 3)):
+            circuit = self.parser.parse(netlist)
+            self.assertEqual([c.name for c in circuit.components], ["R1", "C1"])
+            self.assertEqual(circuit.components[1].source_line, c1_line)
+
+    def test_iter_parse_streams_components(self):
+        netlist = """
+        .subckt inv in out vdd vss
+        M1 out in vdd vdd pmos
+        M2 out in vss vss nmos
+        .ends
+        .subckt buf in out vdd vss
+        X1 in mid vdd vss inv
+        X2 mid out vdd vss inv
+        .ends
+        .subckt nfet d g s b
+        .ends
+        X1 a b vdd 0 inv
+        X2 b g 0 0 nfet w=1u l=1u
+        R1 a 0 1k
+        """
+        streamed = [(scope, comp.name) for scope, comp in self.parser.iter_parse(netlist)]
+        self.assertEqual(streamed, [(("inv",), "M1"), (("inv",), "M2"), (("buf",), "X1"),
+                                    (("buf",), "X2"), ((), "X1"), ((), "X2"), ((), "R1")])
+
+        # Definitions are kept, components are not
+        circuit = self.parser.circuit
+        self.assertEqual([s.name for s in circuit.subcircuits], ["inv", "buf", "nfet"])
+        self.assertEqual(circuit.subcircuits[0].components, [])
+        self.assertEqual(circuit.components, [])
+
+        # The streamed summaries classify like a full parse, in one pass
+        streamed_analyzer = NetlistAnalyzer(circuit)
+        stats = streamed_analyzer.get_stats()
+        self.assertEqual(stats, {"SubcktInstance": 1, "Mosfet": 1, "Resistor": 1})
+
+        analyzer = NetlistAnalyzer(SpiceParser().parse(netlist))
+        self.assertEqual(stats, analyzer.get_stats())
+        self.assertEqual(streamed_analyzer.get_top_cells(), analyzer.get_top_cells())
+        self.assertEqual(streamed_analyzer.get_subckts_using_model("pmos"), ["inv"])
+
+        # A stream can also be counted directly against known definitions
+        self.assertEqual(analyzer.get_stats(self.parser.iter_parse(netlist)), stats)
+
+    def test_parse_parallel_matches_parse(self):
+        netlist = """* deck
+        .param vdd=1.8
+        .subckt inv in out vdd vss
+        + w=1u
+        M1 out in vdd vdd pmos w='2 * w'
+        .subckt nested a b
+        R1 a b 1k
+        .ends nested
+        M2 out in vss vss nmos
+        .ends
+        X1 a b vdd 0 inv
+        .SUBCKT buf in out vdd vss
+        X1 in mid vdd vss inv
+        X2 mid out vdd vss inv
+        .ENDS
+        .model nmos nmos level=1
+        X2 b c vdd 0 buf
+        .subckt open a b
+        C1 a b 1p
+        """
+        serial = self.parser.parse(netlist)
+        parallel = SpiceParser().parse_parallel(netlist, workers=2)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual([s.name for s in parallel.subcircuits], ["inv", "nested", "buf", "open"])
+        self.assertEqual(parallel.subcircuits[2].components[1].source_line, 14)
+
+    def test_parse_parallel_malformed_subckt(self):
+        # A nameless .SUBCKT is rejected by parse() and opens no scope, so
+        # it must not shift the block boundaries either
+        netlist = """
+        .subckt s1 a b
+        R1 a b 1k
+        .ends
+        .subckt
+        R2 a b 1k
+        .ends
+        .subckt s2 a b
+        C1 a b 1p
+        .ends
+        .subckt s3 a b
+        C1 a b 1p
+        .ends
+        """
+        serial = self.parser.parse(netlist)
+        parallel = SpiceParser().parse_parallel(netlist, workers=2)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual([c.name for c in parallel.components], ["R2"])
+        self.assertEqual([s.name for s in parallel.subcircuits], ["s1", "s2", "s3"])
+
 if __name__ == '__main__':
     unittest.main()